@@ -0,0 +1,77 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""_ansi_stripper.pyx
+
+Optional compiled drop-in for `_AnsiStripper` in claude_code_run.py.
+
+Build next to the runner (the runner falls back to pure Python without it):
+  cythonize -i .scripts/_ansi_stripper.pyx
+
+The grammar lives in one place: the runner passes in its packed transition
+table (entries are (action << 4) | next_state, indexed by (state << 8) | byte).
+"""
+
+from cpython.bytearray cimport (
+    PyByteArray_AS_STRING,
+    PyByteArray_GET_SIZE,
+    PyByteArray_Resize,
+)
+from cpython.bytes cimport PyBytes_AS_STRING
+
+cdef enum:
+    CONSUME = 0x10
+    STATE_MASK = 0x0F
+
+
+cdef class AnsiStripper:
+    cdef bytes _table
+    cdef const unsigned char *_transition
+    cdef unsigned char _state
+
+    def __cinit__(self, bytes table):
+        cdef Py_ssize_t num_states = len(table) // 256
+        if num_states == 0 or len(table) != num_states * 256:
+            raise ValueError("transition table size must be a multiple of 256")
+        for code in table:
+            if (code & STATE_MASK) >= num_states:
+                raise ValueError("transition table refers to an unknown state")
+        self._table = table
+        self._transition = <const unsigned char *>PyBytes_AS_STRING(table)
+        self._state = 0
+
+    def feed(
+        self, const unsigned char[::1] data not None, bytearray out not None, end=None
+    ) -> None:
+        cdef Py_ssize_t n = data.shape[0]
+        cdef Py_ssize_t base
+        cdef Py_ssize_t i = 0
+        cdef Py_ssize_t j = 0
+        cdef const unsigned char *transition = self._transition
+        cdef unsigned char state = self._state
+        cdef unsigned char c
+        cdef unsigned char *out_p
+
+        # Clamp end like a slice bound would: n sizes the raw writes below.
+        if end is not None:
+            n = max(0, min(<Py_ssize_t>end, n))
+        if n == 0:
+            return
+
+        base = PyByteArray_GET_SIZE(out)
+
+        # Stripping never grows the data: reserve n bytes in out, write
+        # straight into them, then trim to what was kept.
+        PyByteArray_Resize(out, base + n)
+        out_p = <unsigned char *>PyByteArray_AS_STRING(out) + base
+
+        # Keeps the GIL: out_p points into a bytearray other threads could resize.
+        while i < n:
+            c = transition[(state << 8) | data[i]]
+            if not (c & CONSUME):
+                out_p[j] = data[i]
+                j += 1
+            state = c & STATE_MASK
+            i += 1
+
+        self._state = state
+        if j != n:
+            PyByteArray_Resize(out, base + j)
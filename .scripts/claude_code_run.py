@@ -20,9 +20,12 @@ from __future__ import annotations
 import argparse
 import errno
 import fcntl
+import functools
+import io
 import os
 import pty
-import select
+import re
+import selectors
 import signal
 import struct
 import subprocess
@@ -30,7 +33,75 @@ import sys
 import termios
 import time
 import tty
-from typing import Optional
+from typing import Any, Callable, Optional, Union
+
+try:  # Optional compiled stripper, see _ansi_stripper.pyx.
+    from _ansi_stripper import AnsiStripper as _CAnsiStripper  # type: ignore[import-not-found]
+except ImportError:
+    _CAnsiStripper = None
+
+
+# _AnsiStripper states. OSC/DCS get a dedicated "saw ESC" state each so the
+# whole machine is a single integer.
+_TEXT = 0
+_ESC = 1
+_CSI = 2
+_OSC = 3
+_OSC_ESC = 4
+_DCS = 5
+_DCS_ESC = 6
+_NUM_STATES = 7
+
+# Transition table entries encode (action << 4) | next_state.
+_EMIT = 0x00
+_CONSUME = 0x10
+_STATE_MASK = 0x0F
+
+
+def _build_transition_table() -> bytes:
+    """Build the flat transition table, indexed by (state << 8) | byte."""
+    table = bytearray(_NUM_STATES * 256)
+
+    def on(state: int, byte: int, action: int, next_state: int) -> None:
+        table[(state << 8) | byte] = action | next_state
+
+    for b in range(256):
+        on(_TEXT, b, _EMIT, _TEXT)
+        # Single-character escape sequences like ESC ( B
+        on(_ESC, b, _CONSUME, _TEXT)
+        # CSI: consume until final byte in 0x40-0x7E.
+        on(_CSI, b, _CONSUME, _TEXT if 0x40 <= b <= 0x7E else _CSI)
+        # OSC ends with BEL or ST (ESC \\).
+        on(_OSC, b, _CONSUME, _OSC)
+        on(_OSC_ESC, b, _CONSUME, _TEXT if b == ord("\\") else _OSC)
+        # DCS ends with ST (ESC \\).
+        on(_DCS, b, _CONSUME, _DCS)
+        on(_DCS_ESC, b, _CONSUME, _TEXT if b == ord("\\") else _DCS)
+
+    on(_TEXT, 0x1B, _CONSUME, _ESC)
+    on(_ESC, ord("["), _CONSUME, _CSI)
+    on(_ESC, ord("]"), _CONSUME, _OSC)
+    on(_ESC, ord("P"), _CONSUME, _DCS)
+    on(_OSC, 0x07, _CONSUME, _TEXT)  # BEL
+    on(_OSC, 0x1B, _CONSUME, _OSC_ESC)
+    on(_DCS, 0x1B, _CONSUME, _DCS_ESC)
+
+    return bytes(table)
+
+
+_TRANSITION = _build_transition_table()
+
+# The same grammar as _TRANSITION, for skipping a whole escape sequence in one
+# C-level match. The tail is optional, so a sequence cut off by the end of the
+# chunk still matches, as a bare ESC.
+_SEQUENCE = re.compile(
+    rb"\x1b(?:"
+    rb"\[[^\x40-\x7e]*[\x40-\x7e]"  # CSI
+    rb"|\](?:[^\x07\x1b]|\x1b[^\\])*(?:\x07|\x1b\\)"  # OSC
+    rb"|P(?:[^\x1b]|\x1b[^\\])*\x1b\\"  # DCS
+    rb"|[^\[\]P]"  # single-character escape
+    rb")?"
+)
 
 
 class _AnsiStripper:
@@ -40,83 +111,54 @@ class _AnsiStripper:
     """
 
     def __init__(self) -> None:
-        self._state = "text"  # text|esc|csi|osc|dcs
-        self._osc_esc = False
-        self._dcs_esc = False
-
-    def feed(self, data: bytes) -> bytes:
-        out = bytearray()
+        self._state = _TEXT
+
+    def feed(
+        self, data: Union[bytes, bytearray], out: bytearray, end: Optional[int] = None
+    ) -> None:
+        """Append ``data[:end]`` minus any escape sequences to ``out``.
+
+        ``end`` lets the caller pass a reused read buffer without slicing it.
+        """
+        view = memoryview(data)  # slices of it are copied into out once
+        table = _TRANSITION
+        match = _SEQUENCE.match
+        state = self._state
         i = 0
-        n = len(data)
+        n = len(data) if end is None else end
 
         while i < n:
-            b = data[i]
-
-            if self._state == "text":
-                if b == 0x1B:  # ESC
-                    self._state = "esc"
-                else:
-                    out.append(b)
-                i += 1
-                continue
-
-            if self._state == "esc":
-                if i >= n:
+            if state == _TEXT:
+                # Fast path: copy everything up to the next ESC in one go.
+                j = data.find(0x1B, i, n)
+                if j < 0:
+                    out += view[i:n]
                     break
-                b2 = data[i]
-
-                if b2 == ord("["):
-                    self._state = "csi"
-                elif b2 == ord("]"):
-                    self._state = "osc"
-                    self._osc_esc = False
-                elif b2 == ord("P"):
-                    self._state = "dcs"
-                    self._dcs_esc = False
-                else:
-                    # Single-character escape sequences like ESC ( B
-                    self._state = "text"
-                i += 1
-                continue
-
-            if self._state == "csi":
-                # Consume until final byte in 0x40-0x7E.
-                if 0x40 <= b <= 0x7E:
-                    self._state = "text"
-                i += 1
-                continue
-
-            if self._state == "osc":
-                # OSC ends with BEL or ST (ESC \\).
-                if self._osc_esc:
-                    if b == ord("\\"):
-                        self._state = "text"
-                    self._osc_esc = False
-                    i += 1
+                if j > i:
+                    out += view[i:j]
+                seq_end = match(data, j, n).end()  # type: ignore[union-attr]
+                if seq_end > j + 1:
+                    i = seq_end
                     continue
-
-                if b == 0x07:  # BEL
-                    self._state = "text"
-                elif b == 0x1B:  # ESC
-                    self._osc_esc = True
-                i += 1
+                # Incomplete sequence: walk the rest of the chunk through the
+                # table so the state carries over to the next feed().
+                state = _ESC
+                i = j + 1
                 continue
 
-            if self._state == "dcs":
-                # DCS ends with ST (ESC \\).
-                if self._dcs_esc:
-                    if b == ord("\\"):
-                        self._state = "text"
-                    self._dcs_esc = False
-                    i += 1
-                    continue
+            # Inside an escape sequence every byte is consumed; step the
+            # table until it drops back to text.
+            state = table[(state << 8) | data[i]] & _STATE_MASK
+            i += 1
 
-                if b == 0x1B:
-                    self._dcs_esc = True
-                i += 1
-                continue
+        self._state = state
 
-        return bytes(out)
+
+def _make_stripper() -> _AnsiStripper:
+    """Return the compiled stripper when it is built, else the Python one."""
+    if _CAnsiStripper is not None:
+        return _CAnsiStripper(_TRANSITION)  # same feed() interface
+    return _AnsiStripper()
 
 
 def _get_winsz(fd: int) -> tuple[int, int, int, int]:
@@ -130,7 +172,134 @@ def _set_winsz(fd: int, winsz: tuple[int, int, int, int]) -> None:
     fcntl.ioctl(fd, termios.TIOCSWINSZ, struct.pack("HHHH", rows, cols, xpix, ypix))
 
 
-def _kill_process_group(p: subprocess.Popen[bytes], sig: int) -> None:
+def _exitcode(status: int) -> int:
+    """Decode a waitpid() status the way Popen.returncode does."""
+    # os.waitstatus_to_exitcode() is 3.9+; posix_spawnp() is already in 3.8.
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+
+class _SpawnedProcess:
+    """The subset of subprocess.Popen the runner uses, for a posix_spawn() child."""
+
+    def __init__(self, pid: int) -> None:
+        self.pid = pid
+        self.returncode: Optional[int] = None
+
+    def poll(self) -> Optional[int]:
+        if self.returncode is None:
+            pid, status = os.waitpid(self.pid, os.WNOHANG)
+            if pid:
+                self.returncode = _exitcode(status)
+        return self.returncode
+
+    def wait(self, timeout: Optional[float] = None) -> int:
+        if timeout is None:
+            if self.returncode is None:
+                _, status = os.waitpid(self.pid, 0)
+                self.returncode = _exitcode(status)
+            return self.returncode
+
+        end = time.monotonic() + timeout
+        while True:
+            returncode = self.poll()
+            if returncode is not None:
+                return returncode
+            if time.monotonic() >= end:
+                raise subprocess.TimeoutExpired(str(self.pid), timeout)
+            time.sleep(0.05)
+
+
+_Child = Union["subprocess.Popen[bytes]", _SpawnedProcess]
+
+# Signals Python sets to SIG_IGN at startup; Popen (restore_signals=True)
+# resets them to SIG_DFL in the child, so _spawn does the same.
+_RESTORE_SIGNALS = tuple(
+    getattr(signal, name)
+    for name in ("SIGPIPE", "SIGXFZ", "SIGXFSZ")
+    if hasattr(signal, name)
+)
+
+
+def _inheritable_fds() -> list[int]:
+    """Return this process's open fds above stderr that survive exec."""
+    fds = []
+    for name in os.listdir("/dev/fd"):
+        fd = int(name)
+        if fd <= 2:
+            continue
+        try:
+            if os.get_inheritable(fd):
+                fds.append(fd)
+        except OSError:
+            pass  # the fd listdir() itself used, already closed
+    return fds
+
+
+def _spawn(
+    cmd: list[str], cwd: Optional[str], env: Optional[dict[str, str]], slave_fd: int
+) -> _Child:
+    """Start cmd in a new session with the PTY slave as its stdio.
+
+    Uses posix_spawn() where available, which skips fork()'s page-table copy,
+    with the same child setup Popen would do (close_fds, restore_signals).
+    Falls back to Popen whenever that setup cannot be reproduced.
+    """
+    if hasattr(os, "posix_spawnp") and slave_fd > 2:
+        try:
+            # Match Popen's close_fds=True; non-inheritable fds close on exec.
+            leaked = [fd for fd in _inheritable_fds() if fd != slave_fd]
+            # posix_spawn has no portable chdir action; switch around the call
+            # and return via fchdir so a renamed cwd cannot strand us. O_PATH
+            # only needs search permission on the current directory. Opened
+            # last, so nothing after it can fail and leak it.
+            here = None
+            if cwd is not None:
+                here = os.open(".", getattr(os, "O_PATH", os.O_RDONLY))
+        except OSError:
+            pass  # no way back from cwd, or no /dev/fd: let Popen do it
+        else:
+            file_actions = [
+                (os.POSIX_SPAWN_DUP2, slave_fd, 0),
+                (os.POSIX_SPAWN_DUP2, slave_fd, 1),
+                (os.POSIX_SPAWN_DUP2, slave_fd, 2),
+                (os.POSIX_SPAWN_CLOSE, slave_fd),
+            ]
+            file_actions += [(os.POSIX_SPAWN_CLOSE, fd) for fd in leaked]
+            try:
+                if cwd is not None:
+                    os.chdir(cwd)
+                pid = os.posix_spawnp(
+                    cmd[0],
+                    cmd,
+                    os.environ if env is None else env,
+                    file_actions=file_actions,
+                    setsid=True,  # new session/process group for reliable signaling
+                    setsigdef=_RESTORE_SIGNALS,
+                )
+            except NotImplementedError:
+                pass  # no POSIX_SPAWN_SETSID here
+            else:
+                return _SpawnedProcess(pid)
+            finally:
+                if here is not None:
+                    os.fchdir(here)
+                    os.close(here)
+
+    return subprocess.Popen(
+        cmd,
+        stdin=slave_fd,
+        stdout=slave_fd,
+        stderr=slave_fd,
+        cwd=cwd,
+        env=env,
+        start_new_session=True,  # create a new process group for reliable signaling
+        text=False,
+    )
+
+
+def _kill_process_group(p: _Child, sig: int) -> None:
     try:
         pgid = os.getpgid(p.pid)
     except Exception:
@@ -141,65 +310,147 @@ def _kill_process_group(p: subprocess.Popen[bytes], sig: int) -> None:
         pass
 
 
+# PTY reads go into one reusable buffer of this size.
+_READ_SIZE = 65536
+
+# How long small output chunks may be held back to be written together.
+_FLUSH_INTERVAL_S = 0.02
+
+# Quiet period after the last SIGWINCH before the PTY is resized.
+_RESIZE_DEBOUNCE_S = 0.05
+
+# How often the child is polled when SIGCHLD cannot be caught (not the main
+# thread).
+_CHILD_POLL_INTERVAL_S = 0.05
+
+
+def _on_signal(_signum: int, _frame) -> None:  # type: ignore[no-untyped-def]
+    # Nothing to do here: with signal.set_wakeup_fd() the signal number lands
+    # on the wakeup pipe and run_with_pty's loop handles it.
+    pass
+
+
+def _write_all(fd: int, data: bytearray) -> None:
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view) :]
+
+
 def run_with_pty(
     cmd: list[str],
     cwd: Optional[str],
     timeout_s: Optional[float],
-    env: dict[str, str],
+    env: Optional[dict[str, str]],
     strip_ansi: bool,
 ) -> int:
     master_fd, slave_fd = pty.openpty()
 
-    # Best-effort: propagate current terminal size to the PTY.
-    try:
-        if sys.stdin.isatty():
-            _set_winsz(slave_fd, _get_winsz(sys.stdin.fileno()))
-    except Exception:
-        pass
-
-    p = subprocess.Popen(
-        cmd,
-        stdin=slave_fd,
-        stdout=slave_fd,
-        stderr=slave_fd,
-        cwd=cwd,
-        env=env,
-        start_new_session=True,  # create a new process group for reliable signaling
-        text=False,
-    )
-
-    os.close(slave_fd)
-
+    # Record what gets installed as it goes, so the cleanup below undoes
+    # exactly that even when a step (the spawn, say) raises part way.
+    wake_r = wake_w = -1
+    old_wakeup_fd: Optional[int] = None
+    old_handlers: dict[int, Any] = {}
+    sel: Optional[selectors.BaseSelector] = None
+    master_io: Optional[io.FileIO] = None
     stdin_fd: Optional[int] = None
     raw_mode = False
     old_tty_attrs = None
 
-    if sys.stdin.isatty():
-        stdin_fd = sys.stdin.fileno()
+    try:
+        # Best-effort: propagate current terminal size to the PTY.
+        winsz: Optional[tuple[int, int, int, int]] = None
         try:
-            old_tty_attrs = termios.tcgetattr(stdin_fd)
-            tty.setraw(stdin_fd)
-            raw_mode = True
+            if sys.stdin.isatty():
+                winsz = _get_winsz(sys.stdin.fileno())
+                _set_winsz(slave_fd, winsz)
         except Exception:
-            stdin_fd = None
+            pass
 
-        def _on_winch(_signum: int, _frame) -> None:  # type: ignore[no-untyped-def]
-            try:
-                _set_winsz(master_fd, _get_winsz(stdin_fd))  # type: ignore[arg-type]
-            except Exception:
-                return
+        # Signals arrive as bytes (the signal number) on this pipe, so they
+        # show up as ordinary selector events. Set up before the spawn so an
+        # early SIGCHLD is not lost.
+        wake_r, wake_w = os.pipe()
+        os.set_blocking(wake_r, False)
+        os.set_blocking(wake_w, False)
+        try:
+            old_wakeup_fd = signal.set_wakeup_fd(wake_w, warn_on_full_buffer=False)
+            old_handlers[signal.SIGCHLD] = signal.signal(signal.SIGCHLD, _on_signal)
+        except ValueError:
+            pass  # not the main thread: the loop polls the child on a timer
+        watch_sigchld = signal.SIGCHLD in old_handlers
 
         try:
-            signal.signal(signal.SIGWINCH, _on_winch)
-        except Exception:
-            pass
+            p = _spawn(cmd, cwd, env, slave_fd)
+        finally:
+            os.close(slave_fd)
 
-    stripper = _AnsiStripper() if strip_ansi else None
+        if sys.stdin.isatty():
+            stdin_fd = sys.stdin.fileno()
+            try:
+                old_tty_attrs = termios.tcgetattr(stdin_fd)
+                tty.setraw(stdin_fd)
+                raw_mode = True
+            except Exception:
+                stdin_fd = None
 
-    try:
-        start = time.monotonic()
+            try:
+                old_handlers[signal.SIGWINCH] = signal.signal(
+                    signal.SIGWINCH, _on_signal
+                )
+            except Exception:
+                pass
+
+        # Register once; the selector (epoll on Linux) keeps the interest list.
+        sel = selectors.DefaultSelector()
+        master_events = selectors.EVENT_READ
+        sel.register(master_fd, master_events)
+        sel.register(wake_r, selectors.EVENT_READ)
+        if stdin_fd is not None:
+            sel.register(stdin_fd, selectors.EVENT_READ)
+
+        # Non-blocking, so reads can drain the PTY and input writes never
+        # stall output. stdin stays blocking: on a terminal it usually shares
+        # its open file description with stdout.
+        os.set_blocking(master_fd, False)
+        master_io = io.FileIO(master_fd, "r", closefd=False)
+        buf = bytearray(_READ_SIZE)
+        view = memoryview(buf)
+        stdout_fd = sys.stdout.fileno()
+        pending = bytearray()  # output not yet written to stdout
+
+        def _copy(n: int) -> None:
+            pending.extend(view[:n])
+
+        # Pick the per-chunk step once rather than testing strip_ansi per
+        # read. Both take the byte count just read into buf.
+        emit: Callable[[int], None]
+        if strip_ansi:
+            emit = functools.partial(_make_stripper().feed, buf, pending)
+        else:
+            emit = _copy
+        to_child = bytearray()  # stdin input not yet written to the PTY
+        flush_at: Optional[float] = None
+        resize_at: Optional[float] = None
+        master_eof = False
+        returncode: Optional[int] = None
+        child_signaled = False  # SIGCHLD seen since the last poll()
+
+        # Hot-loop locals: skip global and attribute lookups on every pass.
+        monotonic = time.monotonic
+        select = sel.select
+        readinto = master_io.readinto
+        read = os.read
+        write = os.write
+        poll = p.poll
+        EVENT_READ = selectors.EVENT_READ
+        SIGCHLD = signal.SIGCHLD
+        SIGWINCH = signal.SIGWINCH
+
+        deadline = None if timeout_s is None else monotonic() + timeout_s
         while True:
-            if timeout_s is not None and (time.monotonic() - start) > timeout_s:
+            now = monotonic()
+            if deadline is not None and now > deadline:
+                _write_all(stdout_fd, pending)
                 _kill_process_group(p, signal.SIGTERM)
                 try:
                     p.wait(timeout=2)
@@ -207,64 +458,137 @@ def run_with_pty(
                     _kill_process_group(p, signal.SIGKILL)
                 return 124
 
-            rlist: list[int] = [master_fd]
-            if stdin_fd is not None:
-                rlist.append(stdin_fd)
-
-            ready, _, _ = select.select(rlist, [], [], 0.1)
-
-            if master_fd in ready:
+            if resize_at is not None and now >= resize_at:
+                resize_at = None
                 try:
-                    data = os.read(master_fd, 4096)
-                except OSError as e:
-                    # When the child exits, PTY reads can raise EIO.
-                    if e.errno == errno.EIO:
-                        data = b""
-                    else:
-                        raise
-
-                if data:
-                    if stripper is not None:
-                        data = stripper.feed(data)
-                    if data:
-                        sys.stdout.buffer.write(data)
-                        sys.stdout.buffer.flush()
-                else:
-                    # No more output. If process is done, exit; otherwise keep looping.
-                    if p.poll() is not None:
-                        break
+                    new_winsz = _get_winsz(stdin_fd)  # type: ignore[arg-type]
+                    if new_winsz != winsz:
+                        _set_winsz(master_fd, new_winsz)
+                        winsz = new_winsz
+                except Exception:
+                    pass
 
-            if stdin_fd is not None and stdin_fd in ready:
-                try:
-                    in_data = os.read(stdin_fd, 1024)
-                except OSError:
-                    in_data = b""
+            timeout: Optional[float]
+            if returncode is not None:
+                timeout = 0.0  # child is gone: only drain what is queued
+            else:
+                # Sleep until I/O, a signal, or the nearest pending deadline;
+                # there is no periodic wakeup unless SIGCHLD cannot be caught.
+                poll_at = None if watch_sigchld else now + _CHILD_POLL_INTERVAL_S
+                wake_at = min(
+                    (
+                        t
+                        for t in (deadline, flush_at, resize_at, poll_at)
+                        if t is not None
+                    ),
+                    default=None,
+                )
+                timeout = None if wake_at is None else max(0.0, wake_at - now)
+
+            got_output = False
+            burst = False  # PTY still had data queued when the read budget ran out
+            ready = select(timeout)
+            now = monotonic()
+            for key, mask in ready:
+                if key.fd == wake_r:
+                    try:
+                        signums = read(wake_r, 512)
+                    except OSError:
+                        signums = b""
+                    if SIGWINCH in signums:
+                        # Resizes arrive in storms; apply the last one once
+                        # they settle.
+                        resize_at = now + _RESIZE_DEBOUNCE_S
+                    if SIGCHLD in signums:
+                        child_signaled = True
+                    continue
 
-                if in_data:
+                if key.fd != master_fd:
                     try:
-                        os.write(master_fd, in_data)
+                        to_child += read(key.fd, 1024)
                     except OSError:
                         pass
+                    continue
+
+                if not mask & EVENT_READ:
+                    continue  # writable only; to_child is sent below
+
+                # Read until EAGAIN (up to one buffer's worth per pass) so a
+                # burst of small PTY chunks goes out as a single write.
+                budget = _READ_SIZE
+                while budget > 0:
+                    try:
+                        n = readinto(buf)
+                    except OSError as e:
+                        # When the child exits, PTY reads can raise EIO.
+                        if e.errno == errno.EIO:
+                            n = 0
+                        else:
+                            raise
+
+                    if n is None:  # nothing more queued
+                        break
+                    if not n:
+                        sel.unregister(master_fd)
+                        master_eof = True
+                        break
 
-            if p.poll() is not None:
-                # Drain any remaining output quickly.
+                    emit(n)
+                    budget -= n
+                    got_output = True
+                else:
+                    burst = True
+
+            if to_child and not master_eof:
                 try:
-                    while True:
-                        data = os.read(master_fd, 4096)
-                        if not data:
-                            break
-                        if stripper is not None:
-                            data = stripper.feed(data)
-                        if data:
-                            sys.stdout.buffer.write(data)
-                            sys.stdout.buffer.flush()
-                except OSError:
+                    del to_child[: write(master_fd, to_child)]
+                except BlockingIOError:
                     pass
-                break
-
-        return p.wait()
+                except OSError:
+                    to_child.clear()
+                # Wait for the PTY to become writable while input is queued.
+                events = EVENT_READ
+                if to_child:
+                    events |= selectors.EVENT_WRITE
+                if events != master_events:
+                    sel.modify(master_fd, events)
+                    master_events = events
+
+            # Write as soon as the PTY is drained (EAGAIN). Only a burst that
+            # is still being read is held back, for at most the flush interval.
+            now = monotonic()
+            if pending:
+                if not burst:
+                    flush_at = now
+                elif flush_at is None:
+                    flush_at = now + _FLUSH_INTERVAL_S
+                if now >= flush_at:
+                    _write_all(stdout_fd, pending)
+                    pending.clear()
+                    flush_at = None
+
+            if returncode is None:
+                # Only SIGCHLD can change the child's status, so waitpid()
+                # runs once per signal rather than once per pass.
+                if child_signaled or not watch_sigchld:
+                    child_signaled = False
+                    returncode = poll()
+            elif master_eof or not got_output:
+                _write_all(stdout_fd, pending)
+                return returncode
 
     finally:
+        if master_io is not None:
+            master_io.close()  # closefd=False: leaves master_fd to the code below
+        if sel is not None:
+            sel.close()
+        for signum, handler in old_handlers.items():
+            signal.signal(signum, handler)
+        if old_wakeup_fd is not None:
+            signal.set_wakeup_fd(old_wakeup_fd)
+        for fd in (wake_r, wake_w):
+            if fd >= 0:
+                os.close(fd)
         try:
             os.close(master_fd)
         except Exception:
@@ -318,16 +642,16 @@ def main() -> int:
     if not claude_args:
         parser.error("No claude args provided. Example: -- -p 'hello'")
 
-    env = dict(os.environ)
-    # Keep it predictable in automation.
-    env.setdefault("TERM", env.get("TERM", "xterm-256color"))
+    # Keep it predictable in automation. Set it on our own environment and
+    # let the child inherit it rather than copying os.environ.
+    os.environ.setdefault("TERM", "xterm-256color")
 
     cmd = [args.claude_bin] + claude_args
     return run_with_pty(
         cmd=cmd,
         cwd=args.cwd,
         timeout_s=args.timeout,
-        env=env,
+        env=None,
         strip_ansi=args.strip_ansi,
     )
 